@@ -8,6 +8,17 @@ Cesium.Ion.defaultAccessToken =
 
 const API_URL = "http://127.0.0.1:8000/api/v1/satellites";
 
+// Samples arrive as columns ({ t, lat, lon, alt_km } arrays); zip them into points
+function zipSamples(samples) {
+  if (!samples || !Array.isArray(samples.t)) return [];
+  return samples.t.map((t, i) => ({
+    t,
+    lat: samples.lat[i],
+    lon: samples.lon[i],
+    alt_km: samples.alt_km[i],
+  }));
+}
+
 function Globe() {
   const cesiumContainer = useRef(null);
   const [viewer, setViewer] = useState(null);
@@ -92,9 +103,7 @@ function Globe() {
     let latestTime = null;
 
     satelliteData.forEach((sat) => {
-      if (!Array.isArray(sat.samples) || sat.samples.length < 2) return;
-
-      const valid = sat.samples.filter(
+      const valid = zipSamples(sat.samples).filter(
         (s) =>
           s &&
           typeof s.lat === "number" &&
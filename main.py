@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 import psycopg2
 from sgp4.api import Satrec, jday
 from datetime import datetime
-import math
+from math import asin, atan2, degrees, sqrt
 import redis
 import json
 
@@ -56,9 +56,9 @@ def get_current_position(line1: str, line2: str):
             return None
 
         x, y, z = r  # km
-        r_mag = math.sqrt(x**2 + y**2 + z**2)
-        lat = math.degrees(math.asin(z / r_mag))
-        lon = math.degrees(math.atan2(y, x))
+        r_mag = sqrt(x * x + y * y + z * z)
+        lat = degrees(asin(z / r_mag))
+        lon = degrees(atan2(y, x))
         alt_km = r_mag - 6371.0  # Earth's mean radius (km)
         return {"lat": lat, "lon": lon, "alt_km": alt_km}
     except Exception as e:
@@ -76,10 +76,10 @@ async def get_satellite_positions():
     try:
         # ✅ Step 1: Try cached orbit samples from Redis (preferred)
         if redis_client:
-            cached = redis_client.get(CACHE_KEY)
+            cached = redis_client.hgetall(CACHE_KEY)  # one field per norad_id
             if cached:
                 print("Using cached satellite data from Redis.")
-                return json.loads(cached)
+                return {"satellites": [json.loads(sat) for sat in cached.values()]}
 
         # ⚙️ Step 2: Fall back to compute live positions from PostgreSQL
         print("Redis empty — computing live positions from DB.")
@@ -109,14 +109,12 @@ async def get_satellite_positions():
                     "lat": pos["lat"],
                     "lon": pos["lon"],
                     "alt_km": pos["alt_km"],
-                    "samples": [  # minimal single-point fallback
-                        {
-                            "t": datetime.utcnow().isoformat(),
-                            "lat": pos["lat"],
-                            "lon": pos["lon"],
-                            "alt_km": pos["alt_km"]
-                        }
-                    ]
+                    "samples": {  # minimal single-point fallback, columnar like worker.py
+                        "t": [datetime.utcnow().isoformat()],
+                        "lat": [pos["lat"]],
+                        "lon": [pos["lon"]],
+                        "alt_km": [pos["alt_km"]]
+                    }
                 })
 
         result = {"satellites": satellites}
@@ -1,12 +1,23 @@
 import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import asyncpg
 import redis
-import json
-from datetime import datetime, timedelta, timezone
-from skyfield.api import EarthSatellite, load
-from sgp4.api import Satrec, jday
-import math
+from redis import asyncio as aioredis
+import orjson
+import struct
+import time
 from datetime import datetime
+from sgp4.api import Satrec, SatrecArray
+import numpy as np
+from math import asin, atan2, degrees, pi, sqrt
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; teme_to_geodetic falls back to numpy
+    njit = None
+    prange = range
 
 # --- Global Constants ---
 PREDICT_SECONDS = 90 * 60        # 90 minutes total orbit prediction
@@ -14,6 +25,28 @@ LOOKBACK_SECONDS = 5 * 60        # 🔧 Start 5 minutes in the past
 SAMPLE_INTERVAL = 30             # seconds between samples
 CACHE_KEY = "satellite_positions_v2"
 CACHE_TTL_SECONDS = 60           # refresh every minute
+DAY_NS = 86_400_000_000_000
+UNIX_EPOCH_JD = 2440587.5
+SRID_WGS84 = 4326
+
+# Below this squared lon/lat delta (~1 m) a geopoint is not rewritten
+GEOPOINT_MIN_MOVE_DEG2 = 1e-8
+
+# Little-endian EWKB point with SRID: byte order, type | SRID flag, SRID, x, y (25 bytes)
+EWKB_POINT = struct.Struct("<BIIdd")
+
+# Latest TLE per satellite
+LATEST_TLES_SQL = """
+    SELECT DISTINCT ON (t.satellite_id)
+        s.id AS satellite_db_id,
+        s.name,
+        s.norad_cat_id,
+        t.line1,
+        t.line2
+    FROM tles t
+    JOIN satellites s ON s.id = t.satellite_id
+    ORDER BY t.satellite_id, t.epoch DESC;
+"""
 
 # --- Database Configuration ---
 DB_CONFIG = {
@@ -27,18 +60,17 @@ DB_CONFIG = {
 def compute_realtime_position(line1, line2):
     """Compute current lat, lon, alt from TLE using SGP4."""
     try:
-        sat = Satrec.twoline2rv(line1, line2)
-        now = datetime.utcnow()
-        jd, fr = jday(now.year, now.month, now.day, now.hour, now.minute, now.second + now.microsecond * 1e-6)
+        sat = get_satrec(line1, line2)
+        jd, fr = julian_date(time.time_ns())
         e, r, v = sat.sgp4(jd, fr)
 
         if e != 0:
             return None
 
         x, y, z = r  # km in TEME frame
-        r_mag = math.sqrt(x**2 + y**2 + z**2)
-        lat = math.degrees(math.asin(z / r_mag))
-        lon = math.degrees(math.atan2(y, x))
+        r_mag = sqrt(x * x + y * y + z * z)
+        lat = degrees(asin(z / r_mag))
+        lon = (degrees(atan2(y, x) - gmst_radians(jd, fr)) + 180.0) % 360.0 - 180.0
         alt_km = r_mag - 6371.0  # Earth's mean radius
 
         return {"lat": lat, "lon": lon, "alt_km": alt_km}
@@ -47,84 +79,144 @@ def compute_realtime_position(line1, line2):
         return None
 
 
-# --- Redis Configuration ---
-try:
-    redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
-    redis_client.ping()
-    print("WORKER: Successfully connected to Redis cache.")
-except redis.exceptions.ConnectionError as e:
-    print(f"WORKER Error: Could not connect to Redis: {e}")
-    redis_client = None
-
-# --- Skyfield Loader ---
-ts = load.timescale()
+# --- Redis Configuration (connection is checked in main()) ---
+redis_client = aioredis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
 
 # ==============================================================
 #  Satellite Position + Orbit Prediction Logic
 # ==============================================================
 
-def calculate_satellite_position(line1: str, line2: str):
+def gmst_radians(jd, fr):
     """
-    Calculates current satellite position.
-    Returns dict with ECI (x, y, z) km and geodetic lat/lon/alt.
+    Greenwich mean sidereal time (IAU-82, as used by SGP4) in radians.
+    Works on floats and numpy arrays alike.
     """
-    try:
-        t = ts.now()
-        sat = EarthSatellite(line1, line2)
-
-        # Earth-Centered Inertial coordinates
-        eci = sat.at(t).position.km
-
-        # Geographic subpoint
-        sub = sat.at(t).subpoint()
-        return {
-            "eci_pos": tuple(eci),
-            "geo_pos": (
-                sub.latitude.degrees,
-                sub.longitude.degrees,
-                sub.elevation.km
-            )
-        }
-    except Exception as e:
-        print(f"Error calculating position: {e}")
-        return None
+    t = (jd - 2451545.0 + fr) / 36525.0
+    seconds = 67310.54841 + (876600.0 * 3600.0 + 8640184.812866 + (0.093104 - 6.2e-6 * t) * t) * t
+    return (seconds % 86400.0) * (2.0 * pi / 86400.0)
 
 
-def compute_future_samples(line1: str, line2: str, predict_seconds=PREDICT_SECONDS, sample_interval=SAMPLE_INTERVAL):
+def _teme_to_geo_kernel(r, gmst, lat_out, lon_out, alt_out):
     """
-    🔧 FIXED: Predicts orbit samples starting from LOOKBACK_SECONDS in the past
-    through PREDICT_SECONDS in the future.
-    This ensures Cesium always has valid data at the current time.
+    Fused single-pass version of teme_to_geodetic over an (N, M, 3)
+    position array, writing into preallocated (N, M) outputs.
     """
-    samples = []
-    now_dt_utc = datetime.now(timezone.utc)
-    
-    # 🔧 Start from the past to ensure current time is covered
-    start_time = now_dt_utc - timedelta(seconds=LOOKBACK_SECONDS)
-    total_duration = LOOKBACK_SECONDS + predict_seconds
-    n = int(total_duration // sample_interval) + 1
-    
-    sat = EarthSatellite(line1, line2)
-
-    for i in range(n):
-        t_dt = start_time + timedelta(seconds=i * sample_interval)
-        t_sf = ts.utc(
-            t_dt.year, t_dt.month, t_dt.day,
-            t_dt.hour, t_dt.minute, t_dt.second + t_dt.microsecond / 1e6
-        )
-        try:
-            sub = sat.at(t_sf).subpoint()
-            samples.append({
-                "t": t_dt.isoformat(),
-                "lat": sub.latitude.degrees,
-                "lon": sub.longitude.degrees,
-                "alt_km": sub.elevation.km
-            })
-        except Exception as e:
-            print(f"Sample calculation error at time {t_dt}: {e}")
-            continue
-            
-    return samples
+    n, m = lat_out.shape
+    for i in prange(n):
+        for j in range(m):
+            x = r[i, j, 0]
+            y = r[i, j, 1]
+            z = r[i, j, 2]
+            r_mag = sqrt(x * x + y * y + z * z)
+            lat_out[i, j] = degrees(asin(z / r_mag))
+            lon = degrees(atan2(y, x) - gmst[j])
+            lon_out[i, j] = (lon + 180.0) % 360.0 - 180.0
+            alt_out[i, j] = r_mag - 6371.0
+
+
+teme_to_geo = None
+if njit is not None:
+    teme_to_geo = njit(parallel=True, fastmath=True, cache=True)(_teme_to_geo_kernel)
+
+
+def teme_to_geodetic(r, gmst):
+    """
+    Converts TEME position vectors (..., 3) in km to Earth-fixed
+    lat/lon in degrees and altitude above the mean Earth radius in km.
+    Only the GMST rotation about Z is applied (no nutation/precession),
+    which is well below Cesium's rendering resolution.
+    Uses the compiled kernel for (N, M, 3) batches when Numba is available.
+    """
+    if teme_to_geo is not None and r.ndim == 3:
+        lat = np.empty(r.shape[:2])
+        lon = np.empty(r.shape[:2])
+        alt_km = np.empty(r.shape[:2])
+        teme_to_geo(r, np.ascontiguousarray(gmst, dtype=np.float64), lat, lon, alt_km)
+        return lat, lon, alt_km
+
+    r_mag = np.linalg.norm(r, axis=-1)
+    lat = np.degrees(np.arcsin(r[..., 2] / r_mag))
+    lon = np.degrees(np.arctan2(r[..., 1], r[..., 0]) - gmst)
+    lon = (lon + 180.0) % 360.0 - 180.0
+    alt_km = r_mag - 6371.0  # Earth's mean radius
+    return lat, lon, alt_km
+
+
+def julian_date(t):
+    """
+    Splits datetime64 value(s) (or int nanoseconds since the Unix epoch)
+    into SGP4's (jd, fr) pair with integer day arithmetic, skipping the
+    Python-level calendar breakdown of jday(). Works on scalars and arrays.
+    """
+    ns = np.asarray(t, dtype="datetime64[ns]").astype(np.int64)
+    days, rem = np.divmod(ns, DAY_NS)
+    return UNIX_EPOCH_JD + days, rem / DAY_NS
+
+
+def sample_window(now_ns, predict_seconds=PREDICT_SECONDS, sample_interval=SAMPLE_INTERVAL):
+    """
+    Range of sample slots (multiples of sample_interval since the Unix
+    epoch) from LOOKBACK_SECONDS in the past through predict_seconds
+    in the future, so Cesium always has valid data at the current time.
+    Slots are fixed in time, so samples from earlier cycles stay valid.
+    """
+    first = (now_ns // 1_000_000_000 - LOOKBACK_SECONDS) // sample_interval
+    n = int((LOOKBACK_SECONDS + predict_seconds) // sample_interval) + 1
+    return range(first, first + n)
+
+
+def build_sample_grid(now_ns, slots, sample_interval=SAMPLE_INTERVAL):
+    """
+    Builds the time grid shared by every satellite in a batch.
+    Column 0 is the current time; columns 1: are the given sample slots.
+    Returns (jd, fr) arrays for SGP4.
+    """
+    t_ns = np.empty(len(slots) + 1, dtype=np.int64)
+    t_ns[0] = now_ns
+    t_ns[1:] = np.asarray(slots, dtype=np.int64) * (sample_interval * 1_000_000_000)
+    return julian_date(t_ns)
+
+
+def slot_timestamps(slots, sample_interval=SAMPLE_INTERVAL):
+    """ISO-8601 timestamps of the given sample slots, formatted in one numpy call."""
+    slot_times = (np.asarray(slots, dtype=np.int64) * sample_interval).astype("datetime64[s]")
+    return np.datetime_as_string(slot_times, unit="s", timezone="UTC").tolist()
+
+
+# Parsed TLEs keyed by (line1, line2); lives in whichever process propagates
+_satrec_cache = {}
+
+
+def get_satrec(line1, line2):
+    """Return the parsed Satrec for a TLE, parsing it only the first time."""
+    key = (line1, line2)
+    rec = _satrec_cache.get(key)
+    if rec is None:
+        rec = Satrec.twoline2rv(line1, line2)
+        _satrec_cache[key] = rec
+    return rec
+
+
+def propagate_batch(tles, jd, fr, live_tles):
+    """
+    Propagates every (line1, line2) TLE over the shared (jd, fr) grid
+    in a single SatrecArray call.
+    live_tles is every TLE of the cycle (the batch may be a subset) and
+    bounds the Satrec cache.
+    Top-level with plain inputs so it can run in a worker process.
+    Returns (errors, positions) shaped (N, M) and (N, M, 3).
+    """
+    satrecs = [get_satrec(line1, line2) for line1, line2 in tles]
+
+    # Drop TLEs superseded by a newer epoch or no longer in the DB
+    if len(_satrec_cache) > len(live_tles):
+        live = set(live_tles)
+        for key in [key for key in _satrec_cache if key not in live]:
+            del _satrec_cache[key]
+
+    sat_array = SatrecArray(satrecs)
+    errors, positions, _ = sat_array.sgp4(jd, fr)
+    return errors, positions
 
 # ==============================================================
 #  Database Initialization - Check PostGIS Extension
@@ -178,119 +270,296 @@ async def ensure_postgis(pool):
         print(f"Error setting up PostGIS: {e}")
         return False
 
+# ==============================================================
+#  PostGIS + Redis Writers
+# ==============================================================
+
+def wkb_point(lon, lat):
+    """
+    Encode a WGS84 point as EWKB so PostGIS can take it as-is,
+    without ST_MakePoint/ST_SetSRID per row.
+    """
+    return EWKB_POINT.pack(1, 0x20000001, SRID_WGS84, lon, lat)
+
+
+# Last (lon, lat) written to PostGIS per satellite id
+_last_geopoints = {}
+
+
+def geopoint_moved(sat_id, lon, lat):
+    """True if the satellite moved enough since its last PostGIS write."""
+    last = _last_geopoints.get(sat_id)
+    if last is None:
+        return True
+    d_lon = lon - last[0]
+    d_lat = lat - last[1]
+    return d_lon * d_lon + d_lat * d_lat >= GEOPOINT_MIN_MOVE_DEG2
+
+
+async def update_postgis(conn, geopoints):
+    """
+    Batch update satellite geopoints from {id: (lon, lat)} in one
+    transaction and remember them so unmoved satellites can be skipped
+    next cycle.
+    """
+    if not geopoints:
+        print("PostGIS OK: No satellite moved, skipping update.")
+        return
+
+    records = [
+        (sat_id, wkb_point(lon, lat)) for sat_id, (lon, lat) in geopoints.items()
+    ]
+
+    try:
+        # Binary COPY into a temp table, then one set-based UPDATE.
+        # asyncpg has no geometry codec, so the EWKB goes over as bytea
+        # and PostGIS' bytea -> geometry cast decodes it.
+        async with conn.transaction():
+            # Tiny per-cycle statements: JIT compilation would only add overhead
+            await conn.execute("SET LOCAL jit = off")
+            await conn.execute("""
+                CREATE TEMP TABLE _geopoints (id int, geopoint bytea) ON COMMIT DROP
+            """)
+            await conn.copy_records_to_table("_geopoints", records=records)
+            await conn.execute("""
+                UPDATE satellites s
+                SET geopoint = g.geopoint::geometry
+                FROM _geopoints g
+                WHERE s.id = g.id
+            """)
+        _last_geopoints.update(geopoints)
+        print(f"PostGIS OK: Updated {len(records)} satellites.")
+    except Exception as e:
+        print(f"WORKER Error updating PostGIS: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+# CACHE_KEY fields (norad_ids) written in the last cycle
+_cached_fields = set()
+
+
+async def cache_positions(satellites_data):
+    """
+    Write each satellite's positions + samples to the CACHE_KEY hash,
+    one field per norad_id, and drop fields of satellites that are gone.
+    """
+    if not satellites_data:
+        return
+
+    payloads = {
+        str(sat["norad_id"]): orjson.dumps(sat, option=orjson.OPT_SERIALIZE_NUMPY)
+        for sat in satellites_data
+    }
+    stale = [field for field in _cached_fields if field not in payloads]
+
+    # Every field is rewritten: the current position and the sample window
+    # change each cycle, and the hash may have expired since the last write.
+    # The pipeline runs as MULTI/EXEC, so readers never see a partial hash.
+    try:
+        pipe = redis_client.pipeline()
+        pipe.hset(CACHE_KEY, mapping=payloads)
+        if stale:
+            pipe.hdel(CACHE_KEY, *stale)
+        pipe.expire(CACHE_KEY, CACHE_TTL_SECONDS)
+        await pipe.execute()
+
+        _cached_fields.clear()
+        _cached_fields.update(payloads)
+        print(f"Cache Write OK: Updated {len(payloads)} satellites in Redis.")
+    except Exception as e:
+        print(f"WORKER Error updating Redis cache: {e}")
+        import traceback
+        traceback.print_exc()
+
 # ==============================================================
 #  Async Worker Logic
 # ==============================================================
 
-async def fetch_and_calculate(pool):
+# Per-satellite orbit samples kept across cycles, keyed by satellite id:
+# {"tle": (line1, line2), "lat": array, "lon": array, "alt_km": array}
+# with one entry per slot of _ring_window (NaN where SGP4 failed)
+_sample_rings = {}
+# Sample window the rings currently cover; every ring is advanced together
+_ring_window = None
+
+
+async def propagate_slots(executor, group, now_ns, slots, live_tles):
+    """
+    Propagates a group of satellites over [now] + slots in the worker
+    process. live_tles holds the TLEs of every satellite in the cycle,
+    so the worker's Satrec cache keeps the other group's records.
+    Returns (errors, eci, lat, lon, alt_km) arrays with one row per
+    satellite; column 0 is "now" and failed samples are NaN.
+    """
+    jd, fr = build_sample_grid(now_ns, slots)
+    tles = [(sat['line1'], sat['line2']) for sat in group]
+    loop = asyncio.get_running_loop()
+    errors, positions = await loop.run_in_executor(
+        executor, propagate_batch, tles, jd, fr, live_tles
+    )
+    lats, lons, alts = teme_to_geodetic(positions, gmst_radians(jd, fr))
+
+    failed = errors != 0
+    lats[failed] = np.nan
+    lons[failed] = np.nan
+    alts[failed] = np.nan
+    return errors, positions[:, 0], lats, lons, alts
+
+
+async def fetch_and_calculate(pool, executor):
     """
     Fetch latest TLEs, compute positions + predictions,
     update PostGIS, cache results in Redis.
     """
+    global _ring_window
+
     print(f"[{datetime.now()}] Worker cycle starting: Fetching TLEs...")
     satellites_data = []
-    postgis_update_args = []
+    postgis_updates = {}
 
     try:
+        # One connection for the whole cycle; the SELECT goes through asyncpg's
+        # per-connection statement cache, so it is only prepared once.
         async with pool.acquire() as conn:
-            satellites = await conn.fetch("""
-                SELECT 
-                    s.id as satellite_db_id, 
-                    s.name, 
-                    s.norad_cat_id, 
-                    t.line1, 
-                    t.line2
-                FROM satellites s
-                JOIN (
-                    SELECT 
-                        satellite_id, line1, line2,
-                        ROW_NUMBER() OVER(PARTITION BY satellite_id ORDER BY epoch DESC) AS rn
-                    FROM tles
-                ) t ON s.id = t.satellite_id
-                WHERE t.rn = 1;
-            """)
-
-        print(f"DB Fetch OK: Found {len(satellites)} satellites.")
-
-        # --- Concurrently compute positions ---
-        calculation_tasks = []
-        for sat in satellites:
-            task = asyncio.to_thread(calculate_satellite_position, sat['line1'], sat['line2'])
-            calculation_tasks.append((sat, task))
-
-        for sat, task in calculation_tasks:
-            pos_data = await task
-            if not pos_data:
-                continue
-
-            eci = pos_data["eci_pos"]
-            lat, lon, alt = pos_data["geo_pos"]
+            satellites = await conn.fetch(LATEST_TLES_SQL)
+
+            print(f"DB Fetch OK: Found {len(satellites)} satellites.")
+            if not satellites:
+                return
+
+            # --- Work out which samples the ring buffers are missing ---
+            # Satellites with a new (or no) TLE need the whole window; the rest
+            # only need the slots that entered the window since the last cycle.
+            now_ns = time.time_ns()
+            window = sample_window(now_ns)
+
+            if _ring_window is None or window.start < _ring_window.start:
+                _sample_rings.clear()
+                new_slots = window
+            else:
+                new_slots = range(max(_ring_window.stop, window.start), window.stop)
+
+            fresh, incremental = [], []
+            for sat in satellites:
+                ring = _sample_rings.get(sat['satellite_db_id'])
+                if ring is None or ring["tle"] != (sat['line1'], sat['line2']):
+                    fresh.append(sat)
+                else:
+                    incremental.append(sat)
+
+            # --- Propagate each group with one SatrecArray call in the worker process ---
+            results = {}
+            live_tles = [(sat['line1'], sat['line2']) for sat in satellites]
+            for group, slots in ((fresh, window), (incremental, new_slots)):
+                if group:
+                    columns = await propagate_slots(executor, group, now_ns, slots, live_tles)
+                    for i, sat in enumerate(group):
+                        results[sat['satellite_db_id']] = [column[i] for column in columns]
+            print(f"Propagated {len(fresh)} satellites over the full window, "
+                  f"{len(incremental)} over {len(new_slots)} new slots.")
+
+            # --- Advance the rings: drop expired slots, append new ones ---
+            shift = 0 if _ring_window is None else window.start - _ring_window.start
+            fresh_ids = {sat['satellite_db_id'] for sat in fresh}
+            for sat in satellites:
+                sat_id = sat['satellite_db_id']
+                _, _, lat, lon, alt_km = results[sat_id]
+                if sat_id in fresh_ids:
+                    _sample_rings[sat_id] = {
+                        "tle": (sat['line1'], sat['line2']),
+                        "lat": lat[1:],
+                        "lon": lon[1:],
+                        "alt_km": alt_km[1:],
+                    }
+                else:
+                    ring = _sample_rings[sat_id]
+                    for key, column in (("lat", lat), ("lon", lon), ("alt_km", alt_km)):
+                        ring[key] = np.concatenate((ring[key][shift:], column[1:]))
+
+            live_ids = {sat['satellite_db_id'] for sat in satellites}
+            for sat_id in [sat_id for sat_id in _sample_rings if sat_id not in live_ids]:
+                del _sample_rings[sat_id]
+            for sat_id in [sat_id for sat_id in _last_geopoints if sat_id not in live_ids]:
+                del _last_geopoints[sat_id]
+            _ring_window = window
+            window_iso = slot_timestamps(window)
+
+            for sat in satellites:
+                sat_id = sat['satellite_db_id']
+                errors, eci, lat_row, lon_row, alt_row = results[sat_id]
+                if errors[0] != 0:
+                    print(f"SGP4 error {errors[0]} for {sat['name']}")
+                    continue
+
+                # Orbit samples as columns (the ring arrays, includes past data)
+                ring = _sample_rings[sat_id]
+                samples = {
+                    "t": window_iso,
+                    "lat": ring["lat"],
+                    "lon": ring["lon"],
+                    "alt_km": ring["alt_km"]
+                }
+
+                lat, lon, alt = lat_row[0], lon_row[0], alt_row[0]
+                satellites_data.append({
+                    "id": sat_id,
+                    "name": sat['name'],
+                    "norad_id": sat['norad_cat_id'],
+                    "latitude": lat,
+                    "longitude": lon,
+                    "altitude": alt,
+                    "eci": eci,
+                    "samples": samples
+                })
+
+                # PostGIS update - only for satellites that actually moved
+                if geopoint_moved(sat_id, lon, lat):
+                    postgis_updates[sat_id] = (lon, lat)
+
+            # --- Update PostGIS and cache results in Redis concurrently ---
+            # Both writers log their own errors, so gather only returns once
+            # update_postgis is done with conn.
+            await asyncio.gather(
+                update_postgis(conn, postgis_updates),
+                cache_positions(satellites_data),
+            )
 
-            # Predict orbit samples (now includes past data)
-            try:
-                samples = compute_future_samples(sat['line1'], sat['line2'])
-                print(f"Generated {len(samples)} samples for {sat['name']}")
-            except Exception as e:
-                print(f"Prediction error for {sat['name']}: {e}")
-                samples = []
-
-            satellites_data.append({
-                "id": sat['satellite_db_id'],
-                "name": sat['name'],
-                "norad_id": sat['norad_cat_id'],
-                "latitude": lat,
-                "longitude": lon,
-                "altitude": alt,
-                "eci": eci,
-                "samples": samples
-            })
-
-            # PostGIS update - explicitly cast to float
-            postgis_update_args.append((
-                float(lon),
-                float(lat),
-                sat['satellite_db_id']
-            ))
-
-        # --- Batch update PostGIS geopoints ---
-        if postgis_update_args:
-            async with pool.acquire() as conn:
-                try:
-                    await conn.executemany("""
-                        UPDATE satellites 
-                        SET geopoint = ST_SetSRID(
-                            ST_MakePoint($1::double precision, $2::double precision), 
-                            4326
-                        )
-                        WHERE id = $3
-                    """, postgis_update_args)
-                    print(f"PostGIS OK: Updated {len(postgis_update_args)} satellites.")
-                except Exception as e:
-                    print(f"WORKER Error updating PostGIS: {e}")
-                    import traceback
-                    traceback.print_exc()
-
-        # --- Cache results in Redis ---
-        if redis_client and satellites_data:
-            json_data = json.dumps({"satellites": satellites_data})
-            redis_client.set(CACHE_KEY, json_data, ex=CACHE_TTL_SECONDS)
-            print("Cache Write OK: Updated satellite positions in Redis.")
-
-        print(f"Cycle complete. Processed {len(satellites_data)} satellites.")
+            print(f"Cycle complete. Processed {len(satellites_data)} satellites.")
 
+    except BrokenProcessPool:
+        raise  # main() replaces the dead propagation process
     except (Exception, asyncpg.PostgresError) as error:
         print(f"WORKER Error: {error}")
         import traceback
         traceback.print_exc()
 
 
+def new_propagation_executor():
+    """
+    Process pool for propagate_batch. A single batched SGP4 call per cycle
+    only ever needs one process. Workers are spawned rather than forked:
+    a replacement may be started after Numba's thread pool is running,
+    and forking a multithreaded process can deadlock the child.
+    """
+    return ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
 async def main():
     """
     Initialize connection pool, then run worker cycles continuously.
     """
     pool = None
     try:
-        pool = await asyncpg.create_pool(**DB_CONFIG)
+        # Keep prepared statements for the worker's lifetime; the same few
+        # queries run every cycle.
+        pool = await asyncpg.create_pool(
+            **DB_CONFIG,
+            statement_cache_size=1024,
+            max_cached_statement_lifetime=0,
+        )
         print("WORKER: Database pool created.")
         
         # Ensure PostGIS is set up
@@ -302,13 +571,32 @@ async def main():
         print(f"WORKER Error: Could not create DB pool: {e}")
         return
 
-    if not redis_client:
+    try:
+        await redis_client.ping()
+        print("WORKER: Successfully connected to Redis cache.")
+
+        # CACHE_KEY used to hold a single JSON string; it is now a hash
+        if await redis_client.type(CACHE_KEY) not in ("hash", "none"):
+            await redis_client.delete(CACHE_KEY)
+    except redis.exceptions.ConnectionError as e:
+        print(f"WORKER Error: Could not connect to Redis: {e}")
         print("WORKER Error: No Redis connection. Exiting.")
         return
 
-    while True:
-        await fetch_and_calculate(pool)
-        await asyncio.sleep(CACHE_TTL_SECONDS)
+    executor = new_propagation_executor()
+    try:
+        while True:
+            try:
+                await fetch_and_calculate(pool, executor)
+            except BrokenProcessPool as e:
+                # The propagation process died (OOM, crash in the C extension);
+                # every later submit would fail too, so start a new one.
+                print(f"WORKER Error: Propagation process died ({e}). Restarting it.")
+                executor.shutdown()
+                executor = new_propagation_executor()
+            await asyncio.sleep(CACHE_TTL_SECONDS)
+    finally:
+        executor.shutdown()
 
 # --- Entry Point ---
 if __name__ == "__main__":